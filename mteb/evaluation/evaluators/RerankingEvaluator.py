@@ -1,23 +1,62 @@
 from __future__ import annotations
 
+import gc
+import hashlib
 import logging
+import os
+import sys
 from functools import partial
+from pathlib import Path
 from typing import Any, Callable
 
 import numpy as np
 import torch
 import tqdm
 from sklearn.metrics import average_precision_score
+from torch.nn.utils.rnn import pad_sequence
 
 from mteb.evaluation.evaluators.RetrievalEvaluator import RetrievalEvaluator
 
 from ...encoder_interface import Encoder, EncoderWithQueryCorpusEncode
+from ...requires_package import _is_package_available
 from .Evaluator import Evaluator
 from .model_encode import model_encode
 from .utils import confidence_scores, cos_sim, nAUC
 
 logger = logging.getLogger(__name__)
 
+# SimSIMD provides SIMD cosine kernels that are faster than torch for scoring a
+# single query against its candidates on the CPU, see `RerankingEvaluator._compute_sim_scores_instance`
+_SIMSIMD_AVAILABLE = _is_package_available("simsimd")
+
+# Maximum number of (padded) candidates scored together by `RerankingEvaluator._rerank_batched`,
+# i.e. about 256MB of float32 embeddings with a hidden size of 1024
+_RERANK_MAX_PADDED_DOCS = 2**16
+
+# Instances with more than `_TOP_K_FACTOR * max(k_values)` candidates only keep their
+# top `max(k_values)` scores, see `RerankingEvaluator._top_k_scores`
+_TOP_K_FACTOR = 4
+
+# Interned string ids of positions, used as the ids of the samples and of their
+# candidates so that they are only created once per run. Grown by `_index_ids`.
+_INDEX_IDS: list[str] = [sys.intern(str(i)) for i in range(1024)]
+
+
+def _index_ids(num_ids: int) -> list[str]:
+    """Returns the string ids `["0", ..., str(num_ids - 1)]`, e.g. of the candidates of a sample."""
+    if num_ids > len(_INDEX_IDS):
+        _INDEX_IDS.extend(sys.intern(str(i)) for i in range(len(_INDEX_IDS), num_ids))
+    return _INDEX_IDS[:num_ids]
+
+
+def _to_tensor(embeddings: Any) -> torch.Tensor:
+    """Returns the embeddings as a tensor. Tensors are returned as is (on their device) and
+    array-likes are wrapped without copying when possible.
+    """
+    if torch.is_tensor(embeddings):
+        return embeddings
+    return torch.from_numpy(np.asarray(embeddings))
+
 
 class RerankingEvaluator(Evaluator):
     """This class evaluates a SentenceTransformer model for the task of re-ranking.
@@ -28,6 +67,14 @@ class RerankingEvaluator(Evaluator):
         (relevant) documents, negative is a list of negative (irrelevant) documents.
         - {'query': [], 'positive': [], 'negative': []}. Where query is a list of strings, which embeddings we average
         to get the query embedding.
+    :param chunk_samples: Number of instances encoded together when `use_batched_encoding` is False.
+    :param use_half_precision: Whether to score the MIRACL candidates in float16. This halves the memory traffic of
+        the similarity computation, but the scores are rounded to about 3 significant digits: candidates with close
+        scores may tie or swap, which moves the retrieval metrics by up to about 1e-3.
+    :param embeddings_cache_dir: Directory in which the MIRACL candidates embeddings are cached, keyed by a hash of the
+        model weights, the task and the candidates. Repeated evaluations of the same weights then load them from disk
+        instead of encoding the candidates again, while e.g. a new training checkpoint is encoded anew. Caching is
+        disabled if None, or if the model does not expose its torch weights.
     """
 
     def __init__(
@@ -42,9 +89,14 @@ class RerankingEvaluator(Evaluator):
         limit: int | None = None,
         k_values: list[int] = [1, 3, 5, 10, 20, 100, 1000],
         evaluator_type: str = "standard",
+        use_half_precision: bool = False,
+        chunk_samples: int = 64,
+        embeddings_cache_dir: str | Path | None = None,
         **kwargs,
     ):
         super().__init__(**kwargs)
+        if chunk_samples < 1:
+            raise ValueError(f"chunk_samples must be at least 1 but is {chunk_samples}")
         if limit:
             samples = samples.train_test_split(limit)["test"]
         self.samples = samples
@@ -55,6 +107,11 @@ class RerankingEvaluator(Evaluator):
         self.task_name = task_name
         self.k_values = k_values
         self.evaluator_type = evaluator_type
+        self.use_half_precision = use_half_precision
+        self.chunk_samples = chunk_samples
+        self.embeddings_cache_dir = (
+            Path(embeddings_cache_dir) if embeddings_cache_dir else None
+        )
         self.encode_kwargs = encode_kwargs
 
         if "batch_size" not in self.encode_kwargs:
@@ -100,7 +157,7 @@ class RerankingEvaluator(Evaluator):
 
         logger.info("Encoding queries...")
         if isinstance(self.samples[0]["query"], str):
-            all_query_embs = np.asarray(
+            all_query_embs = _to_tensor(
                 encode_queries_func(
                     [sample["query"] for sample in self.samples],
                     prompt_name=self.task_name,
@@ -136,13 +193,14 @@ class RerankingEvaluator(Evaluator):
                 encode_corpus_func=encode_corpus_func,
                 batched=True,
                 all_query_embs=all_query_embs,
+                model=model,
             )
         return results
 
     def compute_metrics_individual(self, model):
-        """Embeds every (query, positive, negative) tuple individually.
+        """Embeds the (query, positive, negative) tuples `self.chunk_samples` at a time.
         Is slower than the batched version, but saves memory as only the
-        embeddings for one tuple are needed. Useful when you have
+        embeddings for one chunk of tuples are needed. Useful when you have
         a really large test set
         """
         # using encode_queries and encode_corpus functions if they exists,
@@ -213,31 +271,27 @@ class RerankingEvaluator(Evaluator):
             **self.encode_kwargs,
         )
 
+        normalized, all_query_embs, all_docs_embs = self._normalize_for_cos_sim(
+            all_query_embs, all_docs_embs
+        )
+
         # Compute scores and confidence scores
         logger.info("Evaluating...")
-        query_idx, docs_idx = 0, 0
-        for instance in self.samples:
-            num_subqueries = (
-                len(instance["query"]) if isinstance(instance["query"], list) else 1
-            )
-            query_emb = all_query_embs[query_idx : query_idx + num_subqueries]
-            query_idx += num_subqueries
-
+        query_slices, docs_slices = self._instance_slices(
+            self.samples, ("positive", "negative")
+        )
+        for instance, query_slice, docs_slice in zip(
+            self.samples, query_slices, docs_slices
+        ):
             num_pos = len(instance["positive"])
-            num_neg = len(instance["negative"])
-            docs_emb = all_docs_embs[docs_idx : docs_idx + num_pos + num_neg]
-            docs_idx += num_pos + num_neg
-
-            if num_pos == 0 or num_neg == 0:
-                continue
-            is_relevant = [True] * num_pos + [False] * num_neg
             self._apply_sim_scores(
-                query_emb,
-                docs_emb,
-                is_relevant,
+                torch.narrow(all_query_embs, 0, *query_slice),
+                torch.narrow(all_docs_embs, 0, *docs_slice),
+                [True] * num_pos + [False] * (docs_slice[1] - num_pos),
                 all_mrr_scores,
                 all_ap_scores,
                 all_conf_scores,
+                normalized=normalized,
             )
 
     def _encode_candidates_individual(
@@ -248,30 +302,82 @@ class RerankingEvaluator(Evaluator):
         all_ap_scores,
         all_conf_scores,
     ):
-        for instance in tqdm.tqdm(self.samples, desc="Samples"):
-            query = instance["query"]
-            positive = list(instance["positive"])
-            negative = list(instance["negative"])
+        with tqdm.tqdm(total=len(self.samples), desc="Samples") as progress_bar:
+            for chunk_start in range(0, len(self.samples), self.chunk_samples):
+                # encode the instances of a chunk together, so that the encoder
+                # calls are not limited to the texts of a single instance
+                chunk = self.samples[chunk_start : chunk_start + self.chunk_samples]
+                chunk_docs = [
+                    doc
+                    for instance in chunk
+                    for doc in [*instance["positive"], *instance["negative"]]
+                ]
+                query_embs = _to_tensor(
+                    encode_queries_func(
+                        self._flatten_queries(chunk), **self.encode_kwargs
+                    )
+                )
+                docs_embs = _to_tensor(
+                    encode_corpus_func(chunk_docs, **self.encode_kwargs)
+                )
 
-            if len(positive) == 0 or len(negative) == 0:
-                continue
+                query_slices, docs_slices = self._instance_slices(
+                    chunk, ("positive", "negative")
+                )
+                for instance, query_slice, docs_slice in zip(
+                    chunk, query_slices, docs_slices
+                ):
+                    num_pos = len(instance["positive"])
+                    self._apply_sim_scores(
+                        torch.narrow(query_embs, 0, *query_slice),
+                        torch.narrow(docs_embs, 0, *docs_slice),
+                        [True] * num_pos + [False] * (docs_slice[1] - num_pos),
+                        all_mrr_scores,
+                        all_ap_scores,
+                        all_conf_scores,
+                    )
+                progress_bar.update(len(chunk))
+
+    @staticmethod
+    def _instance_slices(
+        samples: list[dict[str, Any]], docs_keys: tuple[str, ...]
+    ) -> tuple[list[tuple[int, int]], list[tuple[int, int]]]:
+        """Locates the queries and documents of each instance in the embeddings of all `samples`
+
+        Args:
+            samples: Instances, in the order in which their queries and documents were encoded
+            docs_keys: Keys of the documents of an instance, e.g. `("positive", "negative")`
 
-            docs = positive + negative
-            is_relevant = [True] * len(positive) + [False] * len(negative)
+        Returns:
+            query_slices: `(start, length)` of the queries of each instance
+            docs_slices: `(start, length)` of the documents of each instance
+        """
+        num_queries = [
+            len(instance["query"]) if isinstance(instance["query"], list) else 1
+            for instance in samples
+        ]
+        num_docs = [
+            sum(len(instance[key]) for key in docs_keys) for instance in samples
+        ]
+        # the queries and documents of each instance are contiguous, so their
+        # offsets are the prefix sums of the number of queries and documents
+        query_offsets = np.cumsum([0] + num_queries)[:-1].tolist()
+        docs_offsets = np.cumsum([0] + num_docs)[:-1].tolist()
+        return list(zip(query_offsets, num_queries)), list(zip(docs_offsets, num_docs))
 
-            if isinstance(query, str):
+    @staticmethod
+    def _flatten_queries(instances: list[dict[str, Any]]) -> list[str]:
+        """Returns the queries of all instances, in order, a list of queries being flattened"""
+        return [
+            query
+            for instance in instances
+            for query in (
+                instance["query"]
+                if isinstance(instance["query"], list)
                 # .encoding interface requires List[str] as input
-                query = [query]
-            query_emb = np.asarray(encode_queries_func(query, **self.encode_kwargs))
-            docs_emb = np.asarray(encode_corpus_func(docs, **self.encode_kwargs))
-            self._apply_sim_scores(
-                query_emb,
-                docs_emb,
-                is_relevant,
-                all_mrr_scores,
-                all_ap_scores,
-                all_conf_scores,
+                else [instance["query"]]
             )
+        ]
 
     def _collect_results(self, all_mrr_scores, all_ap_scores, all_conf_scores):
         mean_ap = np.mean(all_ap_scores)
@@ -289,10 +395,13 @@ class RerankingEvaluator(Evaluator):
         encode_queries_func,
         batched,
         all_query_embs=None,
+        model=None,
     ):
         if batched:
             return self._encode_candidates_miracl_batched(
-                all_query_embs=all_query_embs, encode_corpus_func=encode_corpus_func
+                all_query_embs=all_query_embs,
+                encode_corpus_func=encode_corpus_func,
+                model=model,
             )
         else:
             return self._encode_candidates_miracl_individual(
@@ -300,39 +409,49 @@ class RerankingEvaluator(Evaluator):
                 encode_corpus_func=encode_corpus_func,
             )
 
-    def _encode_candidates_miracl_batched(self, all_query_embs, encode_corpus_func):
+    def _encode_candidates_miracl_batched(
+        self, all_query_embs, encode_corpus_func, model=None
+    ):
         all_docs = []
         for sample in self.samples:
             all_docs.extend(sample["candidates"])
 
-        all_docs_embs = np.asarray(
-            encode_corpus_func(
-                all_docs, prompt_name=self.task_name, **self.encode_kwargs
-            )
+        cache_key = (
+            self._embeddings_cache_key(model)
+            if self.embeddings_cache_dir and model is not None
+            else None
+        )
+        # the same passage is often a candidate of several queries
+        all_docs_embs = self._encode_unique_texts(
+            all_docs,
+            encode_corpus_func,
+            prompt_name=self.task_name,
+            cache_dir=self.embeddings_cache_dir if cache_key else None,
+            cache_key=cache_key or "",
+            **self.encode_kwargs,
         )
 
-        # Compute scores
         logger.info("Evaluating...")
-        query_idx, docs_idx = 0, 0
+        all_pred_scores = self._rerank_miracl_instances(
+            self.samples, all_query_embs, all_docs_embs
+        )
+
         results, qrels = {}, {}
-        for instance in self.samples:
-            num_subqueries = (
-                len(instance["query"]) if isinstance(instance["query"], list) else 1
+        for fake_qid, instance, pred_scores in zip(
+            _index_ids(len(self.samples)), self.samples, all_pred_scores
+        ):
+            results[fake_qid] = pred_scores
+            qrels[fake_qid] = self._miracl_qrels(
+                instance["candidates"], instance["positive"]
             )
-            query_emb = all_query_embs[query_idx : query_idx + num_subqueries]
-            query_idx += num_subqueries
-
-            positive = instance["positive"]
-            docs = instance["candidates"]
-            num_doc = len(docs)
-            docs_emb = all_docs_embs[docs_idx : docs_idx + num_doc]
-            docs_idx += num_doc
 
-            fake_qid = str(query_idx)
-            results[fake_qid] = self.rerank(query_emb, docs_emb)
-            qrels[fake_qid] = {
-                str(i): 1 if doc in positive else 0 for i, doc in enumerate(docs)
-            }
+        # the candidates embeddings are not needed anymore, release them before
+        # pytrec_eval builds its own copy of the qrels and results. The (far
+        # fewer) query embeddings are still referenced by compute_metrics_batched.
+        del all_docs_embs
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
 
         scores_miracl = self._collect_miracl_results(results, qrels)
         return scores_miracl
@@ -341,27 +460,129 @@ class RerankingEvaluator(Evaluator):
         self, encode_queries_func, encode_corpus_func
     ):
         results, qrels = {}, {}
-        for i, instance in enumerate(tqdm.tqdm(self.samples, desc="Samples")):
-            query = instance["query"]
-            positive = set(instance["positive"])
-            docs = list(instance["candidates"])
-
-            if isinstance(query, str):
-                # .encoding interface requires List[str] as input
-                query_emb = np.asarray(
-                    encode_queries_func([query], **self.encode_kwargs)
+        fake_qids = _index_ids(len(self.samples))
+        with tqdm.tqdm(total=len(self.samples), desc="Samples") as progress_bar:
+            for chunk_start in range(0, len(self.samples), self.chunk_samples):
+                # encode the instances of a chunk together, so that the encoder
+                # calls are not limited to the texts of a single instance
+                chunk = self.samples[chunk_start : chunk_start + self.chunk_samples]
+                chunk_docs = [
+                    doc for instance in chunk for doc in instance["candidates"]
+                ]
+                query_embs = _to_tensor(
+                    encode_queries_func(
+                        self._flatten_queries(chunk), **self.encode_kwargs
+                    )
+                )
+                docs_embs = _to_tensor(
+                    encode_corpus_func(chunk_docs, **self.encode_kwargs)
+                )
+                chunk_pred_scores = self._rerank_miracl_instances(
+                    chunk, query_embs, docs_embs
                 )
-                docs_emb = np.asarray(encode_corpus_func(docs, **self.encode_kwargs))
 
-            fake_qid = str(i)
-            results[fake_qid] = self.rerank(query_emb, docs_emb)
-            qrels[fake_qid] = {
-                str(i): 1 if doc in positive else 0 for i, doc in enumerate(docs)
-            }
+                for i, (instance, pred_scores) in enumerate(
+                    zip(chunk, chunk_pred_scores), start=chunk_start
+                ):
+                    fake_qid = fake_qids[i]
+                    results[fake_qid] = pred_scores
+                    qrels[fake_qid] = self._miracl_qrels(
+                        instance["candidates"], instance["positive"]
+                    )
+                progress_bar.update(len(chunk))
 
         scores_miracl = self._collect_miracl_results(results, qrels)
         return scores_miracl
 
+    def _rerank_miracl_instances(
+        self,
+        samples: list[dict[str, Any]],
+        all_query_embs: torch.Tensor,
+        all_docs_embs: torch.Tensor,
+    ) -> list[dict[str, float]]:
+        """Reranks the candidates of each instance = (query, candidates) of `samples`
+
+        Args:
+            samples: Instances to rerank
+            all_query_embs: Query embeddings of all instances, in order, with shape `(total_num_queries, hidden_size)`
+            all_docs_embs: Candidates embeddings of all instances, in order, with shape `(total_num_docs, hidden_size)`
+
+        Returns:
+            all_pred_scores: The reranking scores of each instance, as returned by `self.rerank`
+        """
+        if torch.cuda.is_available():
+            # score on the GPU, keeping the embeddings on the device of the encoder
+            # if it already returned them on one
+            device = all_query_embs.device if all_query_embs.is_cuda else "cuda"
+            all_query_embs = all_query_embs.to(device)
+            all_docs_embs = all_docs_embs.to(device)
+        all_query_embs = all_query_embs.float()
+        all_docs_embs = all_docs_embs.float()
+        normalized, all_query_embs, all_docs_embs = self._normalize_for_cos_sim(
+            all_query_embs, all_docs_embs
+        )
+        if self.use_half_precision:
+            # float16 rather than bfloat16 on the CPU as well: the scores of normalized
+            # embeddings are within [-1, 1], and bfloat16's shorter mantissa would tie
+            # far more candidates with close scores
+            all_query_embs = all_query_embs.half()
+            all_docs_embs = all_docs_embs.half()
+
+        query_slices, docs_slices = self._instance_slices(samples, ("candidates",))
+
+        if normalized:
+            all_pred_scores = self._rerank_batched(
+                all_query_embs, all_docs_embs, query_slices, docs_slices
+            )
+        else:
+            all_pred_scores = [
+                self.rerank(
+                    torch.narrow(all_query_embs, 0, query_start, num_subqueries),
+                    torch.narrow(all_docs_embs, 0, docs_start, num_doc),
+                )
+                for (query_start, num_subqueries), (docs_start, num_doc) in zip(
+                    query_slices, docs_slices
+                )
+            ]
+        return all_pred_scores
+
+    def _normalize_for_cos_sim(
+        self, all_query_embs: torch.Tensor, all_docs_embs: torch.Tensor
+    ) -> tuple[bool, torch.Tensor, torch.Tensor]:
+        """L2-normalizes the embeddings if `self.similarity_fct` is the cosine similarity. The cosine
+        similarity of unit vectors is a plain dot product, so every embedding is normalized once
+        instead of once per sample.
+
+        Returns:
+            normalized: Whether the embeddings were normalized
+            all_query_embs: The (normalized) query embeddings
+            all_docs_embs: The (normalized) candidates embeddings
+        """
+        normalized = self.similarity_fct is cos_sim
+        if normalized:
+            all_query_embs = torch.nn.functional.normalize(all_query_embs, p=2, dim=1)
+            all_docs_embs = torch.nn.functional.normalize(all_docs_embs, p=2, dim=1)
+        return normalized, all_query_embs, all_docs_embs
+
+    @staticmethod
+    def _miracl_qrels(docs: list[str], positive: list[str]) -> dict[str, int]:
+        """Builds the qrels of a single instance = (query, candidates)
+
+        Args:
+            docs: Candidate documents, in the order in which they were scored
+            positive: Relevant documents
+
+        Returns:
+            qrels: Relevance of the relevant candidates, keyed by their position in `docs`.
+                Irrelevant candidates are left out as pytrec_eval treats missing documents as irrelevant.
+        """
+        positive_set = frozenset(positive)
+        doc_ids = _index_ids(len(docs))
+        qrels = {doc_ids[i]: 1 for i, doc in enumerate(docs) if doc in positive_set}
+        # pytrec_eval skips queries without any judgement, keep instances without
+        # relevant candidates in the evaluation
+        return qrels or {_INDEX_IDS[0]: 0}
+
     def _collect_miracl_results(self, results, qrels):
         ndcg, _map, recall, precision, naucs = RetrievalEvaluator.evaluate(
             qrels=qrels,
@@ -374,7 +595,10 @@ class RerankingEvaluator(Evaluator):
         return scores_miracl
 
     def rerank(
-        self, query_emb: torch.Tensor, docs_emb: torch.Tensor
+        self,
+        query_emb: torch.Tensor,
+        docs_emb: torch.Tensor,
+        normalized: bool = False,
     ) -> dict[str, float]:
         """Rerank documents (docs_emb) given the query (query_emb)
 
@@ -382,22 +606,150 @@ class RerankingEvaluator(Evaluator):
             query_emb: Query embedding of shape `(num_queries, hidden_size)`)
                 if `num_queries` > 0: we take the closest document to any of the queries
             docs_emb: Candidates documents embeddings of shape `(num_pos+num_neg, hidden_size)`)
+            normalized: Whether `query_emb` and `docs_emb` are already L2-normalized. If so, the
+                cosine similarity is computed as a plain dot product instead of calling `self.similarity_fct`
 
         Returns:
             similarity_scores:
         """
+        query_emb = torch.atleast_2d(query_emb)
         if not query_emb.shape[0]:
             raise ValueError("Empty query embedding")
 
         if not docs_emb.shape[0]:
             return {"empty-docid": 0}
 
-        pred_scores = self.similarity_fct(query_emb, docs_emb)
-        if len(pred_scores.shape) > 1:
-            pred_scores = torch.amax(pred_scores, dim=0)
+        # (num_queries, num_docs)
+        if normalized:
+            sim_scores = query_emb @ docs_emb.T
+        else:
+            sim_scores = self.similarity_fct(query_emb, docs_emb)
+        # score of each candidate with its closest query, a squeeze for a single query.
+        # A custom `similarity_fct` may already return one score per candidate.
+        pred_scores = (
+            torch.amax(sim_scores, dim=0) if sim_scores.ndim == 2 else sim_scores
+        )
+
+        if pred_scores.shape[0] > _TOP_K_FACTOR * max(self.k_values):
+            return self._top_k_scores(pred_scores)
+
+        # a single tensor -> list conversion instead of one `.item()` per candidate
+        scores = pred_scores.float().cpu().tolist()
+        return dict(zip(_index_ids(len(scores)), scores))
+
+    def _rerank_batched(
+        self,
+        all_query_embs: torch.Tensor,
+        all_docs_embs: torch.Tensor,
+        query_slices: list[tuple[int, int]],
+        docs_slices: list[tuple[int, int]],
+    ) -> list[dict[str, float]]:
+        """Reranks the candidates of all instances, equivalent to calling `self.rerank(..., normalized=True)`
+        on every instance. Instances with similar numbers of candidates are zero-padded to the same number of
+        queries and candidates and scored together with one batched matmul, see `_rerank_batches`.
+
+        Args:
+            all_query_embs: L2-normalized query embeddings of all instances, with shape `(total_num_queries, hidden_size)`
+            all_docs_embs: L2-normalized candidates embeddings of all instances, with shape `(total_num_docs, hidden_size)`
+            query_slices: `(start, length)` of the queries of each instance in `all_query_embs`
+            docs_slices: `(start, length)` of the candidates of each instance in `all_docs_embs`
+
+        Returns:
+            all_pred_scores: The reranking scores of each instance, as returned by `self.rerank`
+        """
+        if any(num_queries == 0 for _, num_queries in query_slices):
+            raise ValueError("Empty query embedding")
+
+        all_pred_scores: list[dict[str, float]] = [{}] * len(query_slices)
+        for batch in self._rerank_batches(docs_slices):
+            batch_query_slices = [query_slices[i] for i in batch]
+            batch_docs_slices = [docs_slices[i] for i in batch]
+            # (batch_size, max_num_queries, hidden_size)
+            query_embs = pad_sequence(
+                [
+                    torch.narrow(all_query_embs, 0, start, n)
+                    for start, n in batch_query_slices
+                ],
+                batch_first=True,
+            )
+            # (batch_size, max_num_docs, hidden_size)
+            docs_embs = pad_sequence(
+                [
+                    torch.narrow(all_docs_embs, 0, start, n)
+                    for start, n in batch_docs_slices
+                ],
+                batch_first=True,
+            )
+            # (batch_size, max_num_queries, max_num_docs)
+            pred_scores = torch.bmm(query_embs, docs_embs.transpose(1, 2))
+
+            # padded queries must never be the closest one to a candidate
+            num_queries = torch.tensor(
+                [n for _, n in batch_query_slices], device=pred_scores.device
+            )
+            is_padding = (
+                torch.arange(query_embs.shape[1], device=pred_scores.device)[None, :]
+                >= num_queries[:, None]
+            )
+            pred_scores = pred_scores.masked_fill(is_padding[:, :, None], float("-inf"))
+            pred_scores = torch.amax(pred_scores, dim=1)
+
+            # padded candidates are dropped when slicing the scores of each instance
+            for i, (idx, scores, (_, num_docs)) in enumerate(
+                zip(batch, pred_scores.float().cpu().tolist(), batch_docs_slices)
+            ):
+                if not num_docs:
+                    all_pred_scores[idx] = {"empty-docid": 0}
+                elif num_docs > _TOP_K_FACTOR * max(self.k_values):
+                    all_pred_scores[idx] = self._top_k_scores(pred_scores[i, :num_docs])
+                else:
+                    all_pred_scores[idx] = dict(
+                        zip(_index_ids(num_docs), scores[:num_docs])
+                    )
+        return all_pred_scores
+
+    @staticmethod
+    def _rerank_batches(docs_slices: list[tuple[int, int]]) -> list[list[int]]:
+        """Groups the instances to score together in `_rerank_batched`. Instances are sorted by their number
+        of candidates, so that a batch is padded to a similar length, and a batch holds at most
+        `_RERANK_MAX_PADDED_DOCS` padded candidates.
 
+        Args:
+            docs_slices: `(start, length)` of the candidates of each instance
+
+        Returns:
+            batches: Indices of the instances of each batch
+        """
+        batches: list[list[int]] = []
+        batch: list[int] = []
+        for idx in sorted(range(len(docs_slices)), key=lambda i: docs_slices[i][1]):
+            # the instances are sorted, so the last one sets the padded length
+            num_docs = max(docs_slices[idx][1], 1)
+            if batch and (len(batch) + 1) * num_docs > _RERANK_MAX_PADDED_DOCS:
+                batches.append(batch)
+                batch = []
+            batch.append(idx)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _top_k_scores(self, pred_scores: torch.Tensor) -> dict[str, float]:
+        """Keeps the `max(self.k_values)` highest scores of an instance, the only ones the retrieval
+        metrics look at
+
+        Args:
+            pred_scores: Scores of the candidates, with shape `(num_docs,)`
+
+        Returns:
+            top_k_scores: The highest scores, keyed by the position of their candidate
+        """
+        top_k_scores, top_k_idx = torch.topk(
+            pred_scores, k=min(max(self.k_values), pred_scores.shape[0])
+        )
+        doc_ids = _index_ids(pred_scores.shape[0])
         return {
-            str(i): score.detach().numpy().item() for i, score in enumerate(pred_scores)
+            doc_ids[i]: score
+            for i, score in zip(top_k_idx.tolist(), top_k_scores.float().cpu().tolist())
         }
 
     def _apply_sim_scores(
@@ -408,8 +760,11 @@ class RerankingEvaluator(Evaluator):
         all_mrr_scores,
         all_ap_scores,
         all_conf_scores,
+        normalized: bool = False,
     ):
-        sim_scores = self._compute_sim_scores_instance(query_emb, docs_emb)
+        sim_scores = self._compute_sim_scores_instance(
+            query_emb, docs_emb, normalized=normalized
+        )
         scores = self._compute_metrics_instance(sim_scores, is_relevant)
         conf_scores = self.conf_scores(sim_scores.tolist())
 
@@ -417,13 +772,70 @@ class RerankingEvaluator(Evaluator):
         all_ap_scores.append(scores["ap"])
         all_conf_scores.append(conf_scores)
 
+    def _embeddings_cache_key(
+        self, model: Encoder | EncoderWithQueryCorpusEncode
+    ) -> str | None:
+        """Identifies the embeddings of the model for this task in the embeddings cache.
+
+        The model is identified by a fingerprint of its weights rather than by its name, so that e.g.
+        the successive checkpoints of a model being trained do not share their cached embeddings.
+
+        Returns:
+            cache_key: The class of the model and a hash of its weights along with the task name and the
+                encode kwargs, or None if the weights of the model can not be found.
+        """
+        # wrappers keep the underlying torch model as an attribute (e.g. `model` or `mdl`)
+        modules = (
+            [model]
+            if isinstance(model, torch.nn.Module)
+            else [
+                value
+                for value in getattr(model, "__dict__", {}).values()
+                if isinstance(value, torch.nn.Module)
+            ]
+        )
+        if not modules:
+            logger.warning(
+                "Could not find the weights of the model, the embeddings will not be cached."
+            )
+            return None
+
+        hasher = hashlib.sha256()
+        for module in modules:
+            for name, tensor in module.state_dict().items():
+                tensor = tensor.detach().cpu().contiguous()
+                hasher.update(f"{name}:{tensor.dtype}:{tuple(tensor.shape)}".encode())
+                hasher.update(tensor.reshape(-1).view(torch.uint8).numpy())
+
+        encode_kwargs = {
+            k: v for k, v in self.encode_kwargs.items() if k != "batch_size"
+        }
+        model_class = f"{type(model).__module__}.{type(model).__qualname__}"
+        return f"{model_class}@{hasher.hexdigest()}/{self.task_name}/{sorted(encode_kwargs.items())}"
+
     @staticmethod
     def _encode_unique_texts(
         all_texts: list[str],
         encode_fn: Callable,
         prompt_name: str | None,
+        cache_dir: Path | None = None,
+        cache_key: str = "",
         **encode_kwargs: Any,
     ):
+        """Encodes the unique texts of `all_texts` only, and duplicates their embeddings.
+
+        Args:
+            all_texts: Texts to encode
+            encode_fn: Encoding function
+            prompt_name: The prompt name to use for encoding
+            cache_dir: If set, the embeddings of the unique texts are stored in this directory and loaded from it
+                (memory-mapped) when the same texts are encoded again with the same `cache_key`
+            cache_key: Identifies the model and encoding arguments within `cache_dir`
+            **encode_kwargs: Additional arguments to pass to `encode_fn`
+
+        Returns:
+            all_texts_embs: Embeddings of `all_texts`, with shape `(len(all_texts), hidden_size)`
+        """
         index_map, all_unique_texts, all_texts_indexes = {}, [], []
         for text in all_texts:
             text_hash = hash(text)
@@ -434,13 +846,46 @@ class RerankingEvaluator(Evaluator):
         logger.warning(
             f"A total on {len(all_texts) - len(all_unique_texts)}/{len(all_texts)} duplicate texts were found during encoding. Only encoding unique text and duplicating embeddings across."
         )
-        all_unique_texts_embs = np.asarray(
-            encode_fn(all_unique_texts, prompt_name=prompt_name, **encode_kwargs)
+        # encode the texts sorted by length, so that the batches of the encoder
+        # are made of texts of similar lengths and need less padding
+        length_sorted_idx = np.argsort(
+            [len(text) for text in all_unique_texts], kind="stable"
         )
-        return all_unique_texts_embs[all_texts_indexes]
+        length_sorted_texts = [all_unique_texts[i] for i in length_sorted_idx]
+
+        cache_path = None
+        if cache_dir is not None:
+            hasher = hashlib.sha256(cache_key.encode())
+            for text in length_sorted_texts:
+                hasher.update(text.encode())
+                hasher.update(b"\0")
+            cache_path = cache_dir / f"{hasher.hexdigest()}.npy"
+
+        if cache_path is not None and cache_path.exists():
+            logger.info(f"Loading cached embeddings from {cache_path}")
+            # copy-on-write memory map, the embeddings are only read from disk when used
+            all_unique_texts_embs = torch.from_numpy(np.load(cache_path, mmap_mode="c"))
+        else:
+            all_unique_texts_embs = _to_tensor(
+                encode_fn(length_sorted_texts, prompt_name=prompt_name, **encode_kwargs)
+            )
+            if cache_path is not None:
+                cache_dir.mkdir(parents=True, exist_ok=True)  # type: ignore
+                tmp_path = cache_path.with_suffix(".tmp.npy")
+                np.save(tmp_path, all_unique_texts_embs.detach().cpu().numpy())
+                os.replace(tmp_path, cache_path)
+        # position of each unique text in the length sorted order
+        length_sorted_rank = np.empty_like(length_sorted_idx)
+        length_sorted_rank[length_sorted_idx] = np.arange(len(length_sorted_idx))
+        return all_unique_texts_embs[
+            torch.from_numpy(length_sorted_rank[all_texts_indexes])
+        ]
 
     def _compute_sim_scores_instance(
-        self, query_emb: torch.Tensor, docs_emb: torch.Tensor
+        self,
+        query_emb: torch.Tensor,
+        docs_emb: torch.Tensor,
+        normalized: bool = False,
     ) -> torch.Tensor:
         """Computes similarity scores for a single instance = (query, positives, negatives)
 
@@ -448,16 +893,52 @@ class RerankingEvaluator(Evaluator):
             query_emb: Query embedding, with shape `(num_queries, hidden_size)`
                 if `num_queries` > 0: we take the closest document to any of the queries
             docs_emb: Candidates documents embeddings, with shape `(num_pos+num_neg, hidden_size)`
+            normalized: Whether `query_emb` and `docs_emb` are already L2-normalized. If so, the
+                cosine similarity is computed as a plain dot product instead of calling `self.similarity_fct`
 
         Returns:
             sim_scores: Query-documents similarity scores, with shape `(num_pos+num_neg,)`
         """
-        sim_scores = self.similarity_fct(query_emb, docs_emb)
-        if len(sim_scores.shape) > 1:
+        if normalized:
+            sim_scores = torch.matmul(query_emb, docs_emb.T)
+        elif (
+            _SIMSIMD_AVAILABLE
+            and self.similarity_fct is cos_sim
+            and query_emb.shape[0] == 1
+            and query_emb.device.type == docs_emb.device.type == "cpu"
+        ):
+            sim_scores = self._simsimd_cos_sim(query_emb, docs_emb)
+        else:
+            sim_scores = self.similarity_fct(query_emb, docs_emb)
+        # a custom `similarity_fct` may already return one score per candidate
+        if sim_scores.ndim == 2:
             sim_scores = torch.amax(sim_scores, dim=0)
 
         return sim_scores
 
+    @staticmethod
+    def _simsimd_cos_sim(
+        query_emb: torch.Tensor, docs_emb: torch.Tensor
+    ) -> torch.Tensor:
+        """Computes the cosine similarity between a single query and its candidates
+        on the CPU with SimSIMD
+
+        Args:
+            query_emb: Query embedding, with shape `(1, hidden_size)`
+            docs_emb: Candidates documents embeddings, with shape `(num_docs, hidden_size)`
+
+        Returns:
+            sim_scores: Query-documents similarity scores, with shape `(1, num_docs)`
+        """
+        import simsimd
+
+        distances = simsimd.cdist(
+            query_emb.detach().float().contiguous().numpy(),
+            docs_emb.detach().float().contiguous().numpy(),
+            metric="cosine",
+        )
+        return torch.from_numpy(1 - np.asarray(distances, dtype=np.float32))
+
     def _compute_metrics_instance(
         self, sim_scores: torch.Tensor, is_relevant: list[bool]
     ) -> dict[str, float]:
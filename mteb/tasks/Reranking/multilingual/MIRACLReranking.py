@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import logging
+import multiprocessing
+import os
 from typing import Any
 
+import torch
 from datasets import Dataset
 
 from mteb.abstasks.MultilingualTask import MultilingualTask
-from mteb.abstasks.TaskMetadata import TaskMetadata
+from mteb.abstasks.TaskMetadata import HFSubset, TaskMetadata
 from mteb.encoder_interface import Encoder, EncoderWithQueryCorpusEncode
 from mteb.evaluation.evaluators import RerankingEvaluator
 from mteb.load_results.mteb_results import ScoresDict
@@ -50,6 +53,64 @@ _CITATION = """@article{10.1162/tacl_a_00595,
 }"""
 
 
+def _evaluate_miracl_subset(
+    model: Encoder | EncoderWithQueryCorpusEncode,
+    data_split: Dataset,
+    task_name: str,
+    encode_kwargs: dict[str, Any],
+    **kwargs: Any,
+) -> ScoresDict:
+    evaluator = RerankingEvaluator(
+        samples=data_split,
+        evaluator_type="miracl",
+        task_name=task_name,
+        encode_kwargs=encode_kwargs,
+        **kwargs,
+    )
+    return evaluator(model)
+
+
+# Model evaluated by the worker processes of `MIRACLReranking.evaluate`, set once per worker by `_init_worker`
+_WORKER_MODEL: Encoder | EncoderWithQueryCorpusEncode | None = None
+
+
+def _init_worker(
+    model: Encoder | EncoderWithQueryCorpusEncode,
+    num_gpus: int,
+    num_threads: int,
+) -> None:
+    """Stores the model of a worker process, pinning the worker to its own GPU if any and
+    to its share of the intra-op threads to avoid oversubscribing the CPU.
+    """
+    global _WORKER_MODEL
+
+    if num_gpus:
+        # workers are numbered from 1, and a worker replacing a dead one gets the next number
+        worker_id = multiprocessing.current_process()._identity[0] - 1
+        os.environ["CUDA_VISIBLE_DEVICES"] = str(worker_id % num_gpus)
+    torch.set_num_threads(num_threads)
+    if torch.cuda.is_available() and hasattr(model, "to"):
+        model.to("cuda")  # type: ignore
+    _WORKER_MODEL = model
+
+
+def _evaluate_miracl_subset_worker(
+    hf_subset: HFSubset,
+    data_split: Dataset,
+    task_name: str,
+    encode_kwargs: dict[str, Any],
+    kwargs: dict[str, Any],
+) -> tuple[HFSubset, ScoresDict]:
+    scores = _evaluate_miracl_subset(
+        _WORKER_MODEL,  # type: ignore
+        data_split,
+        task_name,
+        encode_kwargs,
+        **kwargs,
+    )
+    return hf_subset, scores
+
+
 class MIRACLReranking(MultilingualTask, AbsTaskReranking):
     metadata = TaskMetadata(
         name="MIRACLReranking",
@@ -80,6 +141,71 @@ class MIRACLReranking(MultilingualTask, AbsTaskReranking):
         },
     )
 
+    def evaluate(
+        self,
+        model: Encoder | EncoderWithQueryCorpusEncode,
+        split: str = "test",
+        *,
+        encode_kwargs: dict[str, Any] = {},
+        use_multiprocessing: bool = False,
+        **kwargs: Any,
+    ) -> dict[HFSubset, ScoresDict]:
+        """Evaluates a Sentence Embedding Model on the task, see `AbsTask.evaluate`.
+
+        Args:
+            model: Sentence embedding method.
+            split: Which datasplit to be used.
+            encode_kwargs: Additional keyword arguments that are passed to the model's `encode` method.
+            use_multiprocessing: Whether to evaluate the languages in parallel, using one worker process per GPU,
+                or per CPU core if no GPU is available, and at most one per language. The model is moved to the CPU,
+                if it has a `to` method, and pickled once to every worker, which moves it to its own GPU. Every
+                worker holds its own copy of the model, and the CPU threads are split evenly among the workers.
+            kwargs: Additional keyword arguments that are passed to the _evaluate_subset method.
+        """
+        if not use_multiprocessing:
+            return super().evaluate(model, split, encode_kwargs=encode_kwargs, **kwargs)
+
+        if not self.data_loaded:
+            self.load_data()
+
+        hf_subsets = list(self.dataset.keys())
+        num_gpus = torch.cuda.device_count()
+        num_workers = min(len(hf_subsets), num_gpus or os.cpu_count() or 1)
+        logger.info(
+            f"\nTask: {self.metadata.name}, split: {split}, evaluating {len(hf_subsets)} subsets with {num_workers} workers..."
+        )
+
+        if hasattr(model, "to"):
+            # CUDA tensors are unpickled on their original device, before the
+            # workers are pinned to their own GPU
+            model.to("cpu")  # type: ignore
+        ctx = torch.multiprocessing.get_context("spawn")
+        num_threads = max(1, torch.get_num_threads() // num_workers)
+        with ctx.Pool(
+            num_workers,
+            initializer=_init_worker,
+            initargs=(model, num_gpus, num_threads),
+        ) as pool:
+            subsets_scores = pool.starmap(
+                _evaluate_miracl_subset_worker,
+                [
+                    (
+                        hf_subset,
+                        self.dataset[hf_subset][split],
+                        self.metadata.name,
+                        encode_kwargs,
+                        kwargs,
+                    )
+                    for hf_subset in hf_subsets
+                ],
+            )
+
+        scores = {}
+        for hf_subset, subset_scores in subsets_scores:
+            self._add_main_score(subset_scores)
+            scores[hf_subset] = subset_scores
+        return scores
+
     def _evaluate_subset(
         self,
         model: Encoder | EncoderWithQueryCorpusEncode,
@@ -88,14 +214,9 @@ class MIRACLReranking(MultilingualTask, AbsTaskReranking):
         encode_kwargs: dict[str, Any] = {},
         **kwargs: Any,
     ) -> ScoresDict:
-        evaluator = RerankingEvaluator(
-            samples=data_split,
-            evaluator_type="miracl",
-            task_name=self.metadata.name,
-            encode_kwargs=encode_kwargs,
-            **kwargs,
+        scores = _evaluate_miracl_subset(
+            model, data_split, self.metadata.name, encode_kwargs, **kwargs
         )
-        scores = evaluator(model)
 
         self._add_main_score(scores)
         return scores
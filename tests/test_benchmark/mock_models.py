@@ -40,6 +40,39 @@ class MockTorchbf16Encoder(mteb.Encoder):
         return torch.randn(len(sentences), 10, dtype=torch.bfloat16)
 
 
+class MockRerankingEncoder(torch.nn.Module):
+    """Embeds the queries and candidates of reranking samples with the rows of a random
+    embedding table, so that every text keeps the same embedding across calls and processes.
+    The sentences of every call to `encode` are recorded in `encode_calls`.
+    """
+
+    def __init__(self, samples: list[dict], embedding_dim: int = 16, seed: int = 42):
+        super().__init__()
+        texts = sorted(
+            {
+                text
+                for sample in samples
+                for text in (
+                    sample["query"]
+                    if isinstance(sample["query"], list)
+                    else [sample["query"]]
+                )
+                + list(sample["candidates"])
+            }
+        )
+        self.index = {text: i for i, text in enumerate(texts)}
+        self.embeddings = torch.nn.Embedding(len(texts), embedding_dim)
+        torch.nn.init.normal_(
+            self.embeddings.weight, generator=torch.Generator().manual_seed(seed)
+        )
+        self.encode_calls: list[list[str]] = []
+
+    def encode(self, sentences, prompt_name: str | None = None, **kwargs):
+        self.encode_calls.append(list(sentences))
+        with torch.no_grad():
+            return self.embeddings(torch.tensor([self.index[s] for s in sentences]))
+
+
 class MockSentenceTransformer(SentenceTransformer):
     """A mock implementation of the SentenceTransformer intended to implement just the encode, method using the same arguments."""
 
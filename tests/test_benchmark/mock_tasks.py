@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import random
+from typing import Any
+
 from datasets import Dataset, DatasetDict
 
 from mteb.abstasks import MultilingualTask
@@ -860,6 +863,38 @@ class MockMultilingualSummarizationTask(AbsTaskSummarization, MultilingualTask):
         return metadata_dict
 
 
+def mock_reranking_samples(
+    num_samples: int,
+    num_candidates: int,
+    num_docs: int,
+    *,
+    num_positives: int = 2,
+    multi_query: bool = False,
+    prefix: str = "",
+    seed: int = 42,
+) -> list[dict[str, Any]]:
+    """Random reranking samples, usable by both the standard and the MIRACL evaluators. Each sample
+    has `num_candidates` of `num_docs` documents, of which the first `num_positives` are relevant.
+    With `multi_query`, two out of three samples have a list of two queries.
+    """
+    rng = random.Random(seed)
+    samples = []
+    for i in range(num_samples):
+        candidates = [
+            f"{prefix}doc {j}" for j in rng.sample(range(num_docs), num_candidates)
+        ]
+        query = f"{prefix}query {i}"
+        samples.append(
+            {
+                "query": [query, f"{query} bis"] if multi_query and i % 3 else query,
+                "positive": candidates[:num_positives],
+                "negative": candidates[num_positives:],
+                "candidates": candidates,
+            }
+        )
+    return samples
+
+
 class MockRerankingTask(AbsTaskReranking):
     metadata = TaskMetadata(
         type="Reranking",
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import sys
+
 import pytest
+import torch
 
 from mteb.evaluation.evaluators import RerankingEvaluator
+from mteb.evaluation.evaluators.utils import cos_sim
+from tests.test_benchmark.mock_models import MockRerankingEncoder
+from tests.test_benchmark.mock_tasks import mock_reranking_samples
 
 TOL = 0.0001
 
@@ -56,3 +62,234 @@ class TestRerankingEvaluator:
         assert nauc_scores_map["nAUC_map_max"] == pytest.approx(0.8694, TOL)
         assert nauc_scores_map["nAUC_map_std"] == pytest.approx(0.94065, TOL)
         assert nauc_scores_map["nAUC_map_diff1"] == pytest.approx(0.85460, TOL)
+
+    def test_rerank_normalized(self):
+        query_emb = torch.tensor([[1.0, 2.0, 0.5], [0.3, -1.0, 2.0]])
+        docs_emb = torch.tensor([[0.2, 0.1, 0.9], [1.0, 1.0, 1.0], [-2.0, 0.5, 0.0]])
+
+        expected = self.evaluator.rerank(query_emb, docs_emb)
+        normalized = self.evaluator.rerank(
+            torch.nn.functional.normalize(query_emb, p=2, dim=1),
+            torch.nn.functional.normalize(docs_emb, p=2, dim=1),
+            normalized=True,
+        )
+
+        assert normalized.keys() == expected.keys()
+        for doc_id, score in expected.items():
+            assert normalized[doc_id] == pytest.approx(score, TOL)
+
+    def test_similarity_fct_per_candidate(self):
+        # a custom similarity function may return one score per candidate
+        evaluator = RerankingEvaluator([], similarity_fct=lambda q, d: (q @ d.T)[0])
+        query_emb = torch.tensor([[1.0, 2.0, 0.5]])
+        docs_emb = torch.tensor([[0.2, 0.1, 0.9], [1.0, 1.0, 1.0], [-2.0, 0.5, 0.0]])
+        expected = (query_emb @ docs_emb.T)[0].tolist()
+
+        sim_scores = evaluator._compute_sim_scores_instance(query_emb, docs_emb)
+        pred_scores = evaluator.rerank(query_emb, docs_emb)
+
+        assert sim_scores.tolist() == pytest.approx(expected, TOL)
+        assert list(pred_scores.values()) == pytest.approx(expected, TOL)
+
+    def test_miracl_qrels(self):
+        docs = ["a", "b", "c", "d"]
+
+        assert self.evaluator._miracl_qrels(docs, ["c", "a", "e"]) == {"0": 1, "2": 1}
+        # every occurrence of a repeated positive is relevant
+        assert self.evaluator._miracl_qrels(["a", "p", "b", "p"], ["p"]) == {
+            "1": 1,
+            "3": 1,
+        }
+        # instances without relevant candidates still need a judgement
+        assert self.evaluator._miracl_qrels(docs, ["e"]) == {"0": 0}
+
+    @pytest.mark.parametrize("max_padded_docs", [2**16, 6])
+    def test_rerank_batched(self, monkeypatch, max_padded_docs):
+        monkeypatch.setattr(
+            sys.modules[RerankingEvaluator.__module__],
+            "_RERANK_MAX_PADDED_DOCS",
+            max_padded_docs,
+        )
+        generator = torch.Generator().manual_seed(42)
+        query_slices = [(0, 1), (1, 3), (4, 2), (6, 1)]
+        docs_slices = [(0, 4), (4, 1), (5, 0), (5, 6)]
+        all_query_embs = torch.nn.functional.normalize(
+            torch.randn(7, 8, generator=generator), p=2, dim=1
+        )
+        all_docs_embs = torch.nn.functional.normalize(
+            torch.randn(11, 8, generator=generator), p=2, dim=1
+        )
+
+        all_pred_scores = self.evaluator._rerank_batched(
+            all_query_embs, all_docs_embs, query_slices, docs_slices
+        )
+
+        assert len(all_pred_scores) == len(query_slices)
+        for pred_scores, (q_start, num_q), (d_start, num_d) in zip(
+            all_pred_scores, query_slices, docs_slices
+        ):
+            expected = self.evaluator.rerank(
+                all_query_embs[q_start : q_start + num_q],
+                all_docs_embs[d_start : d_start + num_d],
+                normalized=True,
+            )
+            assert pred_scores.keys() == expected.keys()
+            for doc_id, score in expected.items():
+                assert pred_scores[doc_id] == pytest.approx(score, TOL)
+
+    def test_rerank_batches(self, monkeypatch):
+        monkeypatch.setattr(
+            sys.modules[RerankingEvaluator.__module__], "_RERANK_MAX_PADDED_DOCS", 6
+        )
+        docs_slices = [(0, 4), (4, 1), (5, 0), (5, 6), (11, 2), (13, 1)]
+
+        batches = self.evaluator._rerank_batches(docs_slices)
+
+        assert batches == [[2, 1, 5], [4], [0], [3]]
+
+    def test_encode_unique_texts(self):
+        texts = ["a longer text", "a", "medium", "a", "a longer text", "xyz"]
+        encoded = []
+
+        def encode_fn(sentences, prompt_name=None, **kwargs):
+            encoded.extend(sentences)
+            return [[len(s), ord(s[0])] for s in sentences]
+
+        embs = self.evaluator._encode_unique_texts(texts, encode_fn, prompt_name=None)
+
+        assert sorted(encoded) == sorted(set(texts))
+        assert embs.tolist() == [[len(s), ord(s[0])] for s in texts]
+
+    def test_simsimd_cos_sim(self):
+        pytest.importorskip("simsimd")
+        query_emb = torch.tensor([[1.0, 2.0, 0.5]])
+        docs_emb = torch.tensor([[0.2, 0.1, 0.9], [1.0, 1.0, 1.0], [-2.0, 0.5, 0.0]])
+
+        sim_scores = self.evaluator._simsimd_cos_sim(query_emb, docs_emb)
+
+        assert sim_scores.shape == (1, 3)
+        assert sim_scores[0].tolist() == pytest.approx(
+            cos_sim(query_emb, docs_emb)[0].tolist(), TOL
+        )
+
+        # the standard individual path scores a single query with SimSIMD
+        simsimd_calls = []
+        simsimd_cos_sim = self.evaluator._simsimd_cos_sim
+
+        def spy(*args):
+            simsimd_calls.append(args)
+            return simsimd_cos_sim(*args)
+
+        self.evaluator._simsimd_cos_sim = spy
+        instance_scores = self.evaluator._compute_sim_scores_instance(
+            query_emb, docs_emb
+        )
+
+        assert len(simsimd_calls) == 1
+        assert instance_scores.tolist() == pytest.approx(
+            cos_sim(query_emb, docs_emb)[0].tolist(), TOL
+        )
+
+    def test_encode_unique_texts_cache(self, tmp_path):
+        texts = ["a longer text", "a", "medium", "a"]
+        encoded = []
+
+        def encode_fn(sentences, prompt_name=None, **kwargs):
+            encoded.extend(sentences)
+            return [[len(s), ord(s[0])] for s in sentences]
+
+        embs = self.evaluator._encode_unique_texts(
+            texts, encode_fn, prompt_name=None, cache_dir=tmp_path, cache_key="model"
+        )
+        cached_embs = self.evaluator._encode_unique_texts(
+            texts, encode_fn, prompt_name=None, cache_dir=tmp_path, cache_key="model"
+        )
+
+        assert len(encoded) == 3
+        assert cached_embs.tolist() == embs.tolist()
+
+        self.evaluator._encode_unique_texts(
+            texts, encode_fn, prompt_name=None, cache_dir=tmp_path, cache_key="other"
+        )
+        assert len(encoded) == 6
+
+    def test_rerank_top_k(self):
+        evaluator = RerankingEvaluator([], k_values=[1, 2])
+        query_emb = torch.tensor([[1.0, 0.0]])
+        docs_emb = torch.nn.functional.normalize(
+            torch.tensor([[float(i), 10.0 - i] for i in range(10)]), p=2, dim=1
+        )
+
+        pred_scores = evaluator.rerank(query_emb, docs_emb, normalized=True)
+        batched_pred_scores = evaluator._rerank_batched(
+            query_emb, docs_emb, [(0, 1)], [(0, 10)]
+        )
+
+        assert list(pred_scores.keys()) == ["9", "8"]
+        assert batched_pred_scores == [pred_scores]
+
+    def test_half_precision(self):
+        samples = mock_reranking_samples(120, 50, 500, num_positives=3)
+        model = MockRerankingEncoder(samples, embedding_dim=64)
+
+        scores = RerankingEvaluator(samples, evaluator_type="miracl")(model)
+        half_scores = RerankingEvaluator(
+            samples, evaluator_type="miracl", use_half_precision=True
+        )(model)
+
+        for metric in ["NDCG@10(MIRACL)", "MAP@10(MIRACL)", "Recall@10(MIRACL)"]:
+            assert half_scores[metric] == pytest.approx(scores[metric], abs=1e-3)
+
+    @pytest.mark.parametrize("evaluator_type", ["standard", "miracl"])
+    def test_chunk_samples(self, evaluator_type):
+        samples = mock_reranking_samples(10, 8, 50, multi_query=True)
+        model, chunked_model = (
+            MockRerankingEncoder(samples),
+            MockRerankingEncoder(samples),
+        )
+
+        scores = RerankingEvaluator(
+            samples,
+            evaluator_type=evaluator_type,
+            use_batched_encoding=False,
+            chunk_samples=1,
+        )(model)
+        chunked_scores = RerankingEvaluator(
+            samples,
+            evaluator_type=evaluator_type,
+            use_batched_encoding=False,
+            chunk_samples=64,
+        )(chunked_model)
+
+        assert len(model.encode_calls) == 2 * len(samples)
+        assert len(chunked_model.encode_calls) == 2
+        assert chunked_scores == pytest.approx(scores, nan_ok=True)
+
+        with pytest.raises(ValueError, match="chunk_samples"):
+            RerankingEvaluator(samples, chunk_samples=0)
+
+    def test_embeddings_cache_weights(self, tmp_path):
+        samples = mock_reranking_samples(5, 6, 20)
+        model = MockRerankingEncoder(samples, embedding_dim=8)
+        evaluator = RerankingEvaluator(
+            samples, evaluator_type="miracl", embeddings_cache_dir=tmp_path
+        )
+
+        scores = evaluator(model)
+        num_calls = len(model.encode_calls)
+        assert evaluator(model) == pytest.approx(scores, nan_ok=True)
+        # only the queries are encoded again, the candidates are loaded from the cache
+        assert model.encode_calls[num_calls:] == [[s["query"] for s in samples]]
+
+        # e.g. a new checkpoint of the same model during training
+        with torch.no_grad():
+            model.embeddings.weight.mul_(-1)
+        num_calls = len(model.encode_calls)
+        new_scores = evaluator(model)
+
+        all_candidates = {doc for sample in samples for doc in sample["candidates"]}
+        encoded = {text for call in model.encode_calls[num_calls:] for text in call}
+        assert encoded >= all_candidates
+        assert new_scores == pytest.approx(
+            RerankingEvaluator(samples, evaluator_type="miracl")(model), nan_ok=True
+        )
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from datasets import Dataset
+
+from mteb.tasks.Reranking.multilingual.MIRACLReranking import MIRACLReranking
+from tests.test_benchmark.mock_models import MockRerankingEncoder
+from tests.test_benchmark.mock_tasks import mock_reranking_samples
+
+
+@pytest.mark.parametrize("use_batched_encoding", [True, False])
+def test_miracl_reranking_multiprocessing(use_batched_encoding: bool):
+    task = MIRACLReranking(hf_subsets=["de", "en", "fr"])
+    task.dataset = {
+        hf_subset: {
+            "dev": Dataset.from_list(
+                mock_reranking_samples(10, 10, 30, prefix=f"{hf_subset} ")
+            )
+        }
+        for hf_subset in task.hf_subsets
+    }
+    task.data_loaded = True
+    model = MockRerankingEncoder(
+        [sample for subset in task.dataset.values() for sample in subset["dev"]]
+    )
+
+    scores = task.evaluate(model, "dev", use_batched_encoding=use_batched_encoding)
+    with patch.object(MockRerankingEncoder, "to", autospec=True) as to:
+        parallel_scores = task.evaluate(
+            model,
+            "dev",
+            use_multiprocessing=True,
+            use_batched_encoding=use_batched_encoding,
+        )
+
+    # the model must be pickled from the CPU to be moved to the GPU of each worker
+    to.assert_called_once_with(model, "cpu")
+    assert parallel_scores.keys() == scores.keys()
+    for hf_subset, subset_scores in scores.items():
+        assert parallel_scores[hf_subset] == pytest.approx(subset_scores, nan_ok=True)